@@ -1,8 +1,11 @@
 from flask import Flask, request, render_template, send_file, redirect, url_for, flash, session, jsonify
 from processing import load_activity, load_slots, assign_calls, extract_unique_skills
 from utils import save_temp_file, load_temp_file, generate_excel_buffer
+from uploads import SpoolingRequest, spool_upload
 from cleanup import start_cleanup_thread
-from config import SECRET_KEY, TEMP_DIR
+from sessions import ServerSideSessionInterface, session_store
+from config import SECRET_KEY, TEMP_DIR, ACTIVITY_CHUNK_SIZE, MAX_CONTENT_LENGTH, MAX_UPLOAD_SIZE
+from werkzeug.exceptions import RequestEntityTooLarge
 import webbrowser
 import threading
 import logging
@@ -25,6 +28,9 @@ else:
     app = Flask(__name__)
 
 app.secret_key = SECRET_KEY
+app.session_interface = ServerSideSessionInterface(session_store)
+app.request_class = SpoolingRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 TEMPLATE_NAME = 'template.html'
 
 # --- Перед каждым запросом ---
@@ -86,12 +92,12 @@ def index():
             session.modified = True
 
             # Обрабатываем файл активности
-            activity_df = load_activity(activity_file, skill_groups)
+            activity_df = load_activity(spool_upload(activity_file), skill_groups, chunk_size=ACTIVITY_CHUNK_SIZE)
 
             # Обрабатываем файл слотов (если нужен)
             slots_df = None
             if selection_strategy == 'by_delta':
-                slots_df = load_slots(slots_file)
+                slots_df = load_slots(spool_upload(slots_file))
 
             # Назначаем активность
             result_df = assign_calls(
@@ -120,6 +126,8 @@ def index():
                                    available_skills=available_skills,
                                    last_settings=session.get('last_settings', {}))
 
+        except RequestEntityTooLarge:
+            raise
         except Exception as e:
             logging.exception("Ошибка обработки запроса")
             flash(f"Произошла ошибка: {e}")
@@ -144,15 +152,27 @@ def extract_skills():
         return jsonify({'error': 'Empty filename'}), 400
 
     try:
-        df = pd.read_excel(file)
+        df = pd.read_excel(spool_upload(file))
         skills = extract_unique_skills(df)
         session['available_skills'] = skills
         session.modified = True
         return jsonify({'skills': skills})
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         logging.exception("Ошибка извлечения скилл-групп")
         return jsonify({'error': str(e)}), 500
 
+# --- Слишком большой файл ---
+@app.errorhandler(RequestEntityTooLarge)
+def too_large(e):
+    logging.warning("Отклонена загрузка: превышен допустимый размер")
+    message = f"Файл слишком большой (максимум {MAX_UPLOAD_SIZE // (1024 * 1024)} МБ)"
+    if request.path == url_for('extract_skills'):
+        return jsonify({'error': message}), 413
+    flash(message)
+    return redirect(url_for('index'))
+
 # --- Скачивание результата ---
 @app.route('/download')
 def download():
@@ -2,10 +2,11 @@ import os
 import time
 import threading
 import logging
-from config import TEMP_DIR, CLEANUP_INTERVAL, FILE_MAX_AGE
+from config import TEMP_DIR, CLEANUP_INTERVAL, FILE_MAX_AGE, SESSION_MAX_AGE
+from sessions import session_store
 
 def cleanup_old_files():
-    """Удаляет старые временные файлы."""
+    """Удаляет старые временные файлы и устаревшие сессии."""
     while True:
         try:
             now = time.time()
@@ -17,6 +18,10 @@ def cleanup_old_files():
                         logging.info(f"Удалён устаревший файл: {filename}")
                     except Exception as e:
                         logging.warning(f"Не удалось удалить файл {filename}: {e}")
+
+            removed = session_store.cleanup(SESSION_MAX_AGE)
+            if removed:
+                logging.info(f"Удалено устаревших сессий: {removed}")
             time.sleep(CLEANUP_INTERVAL)
         except Exception as e:
             logging.error(f"Ошибка при очистке файлов: {e}")
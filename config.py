@@ -21,6 +21,19 @@ logging.basicConfig(
 CLEANUP_INTERVAL = 3600  # секунд (1 час)
 FILE_MAX_AGE = 3600      # секунд (1 час)
 
+# --- Настройки чтения файла активности ---
+ACTIVITY_CHUNK_SIZE = 5000  # строк в порции (None — читать файл целиком)
+
+# --- Ограничения загрузки файлов ---
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024                       # байт на один файл
+MAX_CONTENT_LENGTH = 2 * MAX_UPLOAD_SIZE + 1024 * 1024   # байт на весь запрос
+UPLOAD_CHUNK_SIZE = 1024 * 1024                          # байт в порции записи на диск
+
+# --- Настройки хранилища сессий ---
+SESSION_BACKEND = 'memory'   # 'memory' (LRU в процессе), 'file' или 'sqlite' для нескольких воркеров
+SESSION_MAX_ENTRIES = 1000   # максимум сессий в памяти для 'memory'
+SESSION_MAX_AGE = 3600       # секунд (1 час) без обращений до удаления сессии
+
 # --- Скрываем папку (только для Windows) ---
 if os.name == 'nt':
     ctypes.windll.kernel32.SetFileAttributesW(TEMP_DIR, 0x02)
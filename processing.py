@@ -1,6 +1,7 @@
 import pandas as pd
 import logging
-from typing import List, Literal
+from typing import Iterator, List, Literal, Optional, Union
+from openpyxl import load_workbook
 from werkzeug.datastructures import FileStorage
 from config import (
     COL_SKILL_GROUP, COL_TIME, COL_ASSIGNED_ACTIVITY, COL_CATEGORY,
@@ -12,32 +13,174 @@ from config import (
 )
 
 
-def load_activity(file: FileStorage, skill_groups: List[str]) -> pd.DataFrame:
-    """Загружает и фильтрует активность по списку скилл-групп."""
+ACTIVITY_REQUIRED = {
+    COL_ACTIVITY_DATE, COL_START_TIME, COL_END_TIME,
+    COL_MAIN_ACTIVITY, COL_FUNC, COL_MASTER_ID, COL_SKILL_GROUP
+}
+
+# Строки, которые pd.read_excel по умолчанию считает пропусками
+NA_STRINGS = {
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null'
+}
+
+
+def skill_label(value) -> str:
+    """
+    Приводит значение скилл-группы к виду для отображения.
+
+    Одинаково работает для сырых значений ячеек и для значений после
+    pd.read_excel: целые числа не получают хвост '.0', пропуски дают ''.
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    label = str(value).strip()
+    if label in NA_STRINGS:
+        return ''
+    if label.endswith('.0') and label[:-2].lstrip('-').isdigit():
+        label = label[:-2]
+    return label
+
+
+def skill_key(value) -> str:
+    """Ключ для сравнения скилл-групп без учёта регистра."""
+    return skill_label(value).lower()
+
+
+def _dedupe_columns(header) -> List[str]:
+    """Переименовывает повторяющиеся заголовки так же, как pd.read_excel (X, X.1, ...)."""
+    columns = []
+    counts = {}
+    used = set()
+    for i, value in enumerate(header):
+        base = str(value) if value is not None else f'Unnamed: {i}'
+        name = base
+        n = counts.get(base, 0)
+        while name in used:
+            n += 1
+            name = f"{base}.{n}"
+        counts[base] = n
+        used.add(name)
+        columns.append(name)
+    return columns
+
+
+def iter_activity_chunks(
+    file: Union[str, FileStorage],
+    skill_groups: List[str],
+    chunk_size: int
+) -> Iterator[pd.DataFrame]:
+    """
+    Построчно читает лист активности и отдаёт порции только нужных строк.
+
+    Фильтр по скилл-группам и по функционалу VAL_OMNI применяется прямо при
+    чтении: неподходящие строки отбрасываются до создания DataFrame.
+    """
+    # openpyxl проверяет расширение только у путей; файловый объект читается
+    # по содержимому, поэтому спул без расширения .xlsx тоже подходит
+    fh = open(file, 'rb') if isinstance(file, str) else file
+    wb = load_workbook(fh, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("Файл активности пуст.")
+
+        columns = _dedupe_columns(header)
+        missing = ACTIVITY_REQUIRED - set(columns)
+        if missing:
+            raise ValueError(f"В активности отсутствуют: {missing}")
+
+        skill_idx = columns.index(COL_SKILL_GROUP)
+        func_idx = columns.index(COL_FUNC)
+        norm = {skill_key(s) for s in skill_groups}
+        norm.discard('')
+
+        has_rows = False
+        chunk = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            has_rows = True
+
+            skill = row[skill_idx] if skill_idx < len(row) else None
+            if skill_key(skill) not in norm:
+                continue
+            func = row[func_idx] if func_idx < len(row) else None
+            if func is None or VAL_OMNI not in str(func).lower():
+                continue
+
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+
+        if not has_rows:
+            raise ValueError("Файл активности пуст.")
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        wb.close()
+        if fh is not file:
+            fh.close()
+
+
+def load_activity(
+    file: Union[str, FileStorage],
+    skill_groups: List[str],
+    chunk_size: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Загружает активность и оставляет строки выбранных скилл-групп с функционалом VAL_OMNI.
+
+    Если задан chunk_size, файл читается порциями с фильтрацией при чтении
+    (см. iter_activity_chunks). В обоих режимах проверка дат выполняется
+    только для оставшихся строк.
+    """
     logging.info("Начало обработки активности...")
 
+    if chunk_size:
+        chunks = list(iter_activity_chunks(file, skill_groups, chunk_size))
+        if not chunks:
+            raise ValueError("Нет данных для выбранных скилл-групп")
+        df = pd.concat(chunks, ignore_index=True)
+        df = _parse_activity(df)
+        logging.info(f"Обработка активности завершена. Найдено: {len(df)} записей")
+        return df
+
     df = pd.read_excel(file)
     if df.empty:
         raise ValueError("Файл активности пуст.")
 
-    required = {
-        COL_ACTIVITY_DATE, COL_START_TIME, COL_END_TIME,
-        COL_MAIN_ACTIVITY, COL_FUNC, COL_MASTER_ID, COL_SKILL_GROUP
-    }
-    missing = required - set(df.columns)
+    missing = ACTIVITY_REQUIRED - set(df.columns)
     if missing:
         raise ValueError(f"В активности отсутствуют: {missing}")
 
+    norm = {skill_key(s) for s in skill_groups}
+    norm.discard('')
+    df = df[
+        df[COL_SKILL_GROUP].map(skill_key).isin(norm)
+        & df[COL_FUNC].astype(str).str.contains(VAL_OMNI, case=False, na=False)
+    ]
+    if df.empty:
+        raise ValueError("Нет данных для выбранных скилл-групп")
+
+    df = _parse_activity(df)
+    logging.info(f"Обработка активности завершена. Найдено: {len(df)} записей")
+    return df
+
+
+def _parse_activity(df: pd.DataFrame) -> pd.DataFrame:
+    """Проверяет даты и строит колонки start/end для отобранных строк."""
     date_format_pattern = r'(\d{2}\.\d{2}\.\d{4})|(\d{4}-\d{2}-\d{2})'
     if not df[COL_ACTIVITY_DATE].astype(str).str.fullmatch(date_format_pattern).all():
         raise ValueError("Дата должна быть в формате DD.MM.YYYY или YYYY-MM-DD")
 
     df = df.copy()
-    df['skill_lower'] = df[COL_SKILL_GROUP].astype(str).str.strip().str.lower()
-    norm = [s.strip().lower() for s in skill_groups]
-    df = df[df['skill_lower'].isin(norm)]
-    if df.empty:
-        raise ValueError("Нет данных для выбранных скилл-групп")
+    df['skill_lower'] = df[COL_SKILL_GROUP].map(skill_key)
 
     df[COL_START] = pd.to_datetime(
         df[COL_ACTIVITY_DATE].astype(str) + ' ' + df[COL_START_TIME].astype(str),
@@ -65,8 +208,6 @@ def load_activity(file: FileStorage, skill_groups: List[str]) -> pd.DataFrame:
 
     df['main_act_lower'] = df[COL_MAIN_ACTIVITY].str.lower()
     df['func_lower'] = df[COL_FUNC].str.lower()
-
-    logging.info(f"Обработка активности завершена. Найдено: {len(df)} записей")
     return df
 
 
@@ -74,12 +215,12 @@ def extract_unique_skills(df: pd.DataFrame) -> List[str]:
     """Извлекает уникальные скилл-группы из файла активности."""
     if df.empty or COL_SKILL_GROUP not in df.columns:
         return []
-    skills = df[COL_SKILL_GROUP].astype(str).unique()
-    skills = [s.strip() for s in skills if s.strip() and s.strip().lower() != 'nan']
-    return sorted(set(skills))
+    skills = {skill_label(s) for s in df[COL_SKILL_GROUP].unique()}
+    skills.discard('')
+    return sorted(skills)
 
 
-def load_slots(file: FileStorage) -> pd.DataFrame:
+def load_slots(file: Union[str, FileStorage]) -> pd.DataFrame:
     """Загрузка и обработка слотов (30-минутные интервалы + дельта)."""
     logging.info("Начало обработки слотов...")
 
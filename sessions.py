@@ -0,0 +1,278 @@
+import os
+import time
+import secrets
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from werkzeug.datastructures import CallbackDict
+from config import TEMP_DIR, SESSION_BACKEND, SESSION_MAX_ENTRIES, SESSION_MAX_AGE
+
+SESSION_DIR = os.path.join(TEMP_DIR, 'sessions')
+
+
+def _valid_sid(sid: Optional[str]) -> bool:
+    """ID сессии — 64 hex-символа (используется в именах файлов)."""
+    return bool(sid) and len(sid) == 64 and all(c in '0123456789abcdef' for c in sid)
+
+
+class MemoryStore:
+    """
+    Хранилище сессий в памяти процесса с вытеснением по LRU.
+
+    Как и остальные хранилища, работает только с уже сериализованными
+    строками, поэтому каждый запрос получает независимую копию данных.
+    """
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, max_age: int = SESSION_MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sid: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(sid)
+            now = time.time()
+            if item is None or now - item[0] > self.max_age:
+                return None
+            # Чтение продлевает жизнь сессии: срок считается от последнего обращения
+            self._data[sid] = (now, item[1])
+            self._data.move_to_end(sid)
+        return item[1]
+
+    def set(self, sid: str, payload: str) -> None:
+        with self._lock:
+            self._data[sid] = (time.time(), payload)
+            self._data.move_to_end(sid)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, sid: str) -> None:
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def cleanup(self, max_age: int) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (updated, _) in self._data.items() if now - updated > max_age]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+
+class FileStore:
+    """Хранилище сессий в файлах (общее для нескольких воркеров)."""
+
+    def __init__(self, directory: str = SESSION_DIR, max_age: int = SESSION_MAX_AGE):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, sid: str) -> str:
+        return os.path.join(self.directory, f"{sid}.json")
+
+    def get(self, sid: str) -> Optional[str]:
+        path = self._path(sid)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path, encoding='utf-8') as f:
+                payload = f.read()
+            # Обновляем mtime — по нему cleanup отсчитывает срок жизни
+            os.utime(path)
+            return payload
+        except OSError:
+            return None
+
+    def set(self, sid: str, payload: str) -> None:
+        path = self._path(sid)
+        tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    def delete(self, sid: str) -> None:
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+    def cleanup(self, max_age: int) -> int:
+        now = time.time()
+        removed = 0
+        for filename in os.listdir(self.directory):
+            filepath = os.path.join(self.directory, filename)
+            try:
+                if now - os.path.getmtime(filepath) > max_age:
+                    os.remove(filepath)
+                    removed += 1
+            except OSError as e:
+                logging.warning(f"Не удалось удалить файл сессии {filename}: {e}")
+        return removed
+
+
+class SqliteStore:
+    """Хранилище сессий в SQLite (общее для нескольких воркеров)."""
+
+    def __init__(self, path: str = os.path.join(SESSION_DIR, 'sessions.sqlite3'), max_age: int = SESSION_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions '
+                '(sid TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, sid: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT data FROM sessions WHERE sid = ? AND updated >= ?',
+                (sid, now - self.max_age)
+            ).fetchone()
+            if row:
+                conn.execute('UPDATE sessions SET updated = ? WHERE sid = ?', (now, sid))
+        return row[0] if row else None
+
+    def set(self, sid: str, payload: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (sid, data, updated) VALUES (?, ?, ?)',
+                (sid, payload, time.time())
+            )
+
+    def delete(self, sid: str) -> None:
+        with self._connect() as conn:
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def cleanup(self, max_age: int) -> int:
+        with self._connect() as conn:
+            cur = conn.execute('DELETE FROM sessions WHERE updated < ?', (time.time() - max_age,))
+        return cur.rowcount
+
+
+STORES = {
+    'memory': MemoryStore,
+    'file': FileStore,
+    'sqlite': SqliteStore,
+}
+
+
+def create_session_store(backend: str = SESSION_BACKEND):
+    """Создаёт хранилище сессий по имени бэкенда из конфигурации."""
+    if backend not in STORES:
+        raise ValueError(f"Неизвестный бэкенд сессий: {backend}")
+    return STORES[backend]()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Сессия, данные которой лежат на сервере, а в cookie — только ID."""
+
+    accessed = False
+
+    def __init__(self, initial=None, sid: Optional[str] = None, new: bool = False):
+        def on_update(self):
+            self.modified = True
+            self.accessed = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        self.accessed = True
+        return super().get(key, default)
+
+    def setdefault(self, key, default=None):
+        self.accessed = True
+        return super().setdefault(key, default)
+
+    @property
+    def permanent(self) -> bool:
+        return self.get('_permanent', False)
+
+    @permanent.setter
+    def permanent(self, value: bool) -> None:
+        # before_request выставляет флаг на каждом запросе — не считаем это изменением
+        if dict.get(self, '_permanent') != bool(value):
+            self['_permanent'] = bool(value)
+
+    def has_data(self) -> bool:
+        """Есть ли в сессии что-то кроме служебного флага _permanent."""
+        return any(key != '_permanent' for key in self)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Хранит сессии в session_store; cookie содержит только ID сессии.
+
+    Данные сериализуются тем же TaggedJSONSerializer, что и в cookie-сессии
+    Flask, поэтому кортежи, Markup, datetime и bytes сохраняют свой тип.
+    """
+
+    serializer = session_json_serializer
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if _valid_sid(sid):
+            payload = self.store.get(sid)
+            if payload is not None:
+                try:
+                    return ServerSideSession(self.serializer.loads(payload), sid=sid)
+                except ValueError:
+                    logging.warning("Повреждённые данные сессии, создаётся новая")
+        return ServerSideSession(sid=secrets.token_hex(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session.has_data():
+            if not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            self.store.set(session.sid, self.serializer.dumps(dict(session)))
+
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app)
+            )
+
+
+session_store = create_session_store()
@@ -0,0 +1,76 @@
+import datetime as dt
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from processing import load_activity, extract_unique_skills
+
+HEADER = [
+    'activity_date', 'start_time', 'end_time', 'main_act',
+    'Основной функционал', 'masterId', 'Скилл-группа'
+]
+
+
+def write_activity(path, rows, header=HEADER):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return str(path)
+
+
+def row(master_id, skill, func='omni', date='01.02.2024', main_act='Чат'):
+    return [date, dt.time(9, 0), dt.time(12, 0), main_act, func, master_id, skill]
+
+
+@pytest.fixture
+def activity(tmp_path):
+    rows = [row(i, 'A', func='omni' if i % 3 else 'другое') for i in range(7)]
+    rows += [row(100 + i, 'B') for i in range(3)]
+    return write_activity(tmp_path / 'activity.xlsx', rows)
+
+
+@pytest.mark.parametrize('chunk_size', [2, 5000])
+def test_chunked_matches_full_read(activity, chunk_size):
+    full = load_activity(activity, ['a'])
+    chunked = load_activity(activity, ['a'], chunk_size=chunk_size)
+
+    assert list(chunked.columns) == list(full.columns)
+    assert chunked['masterId'].tolist() == full['masterId'].tolist() == [1, 2, 4, 5]
+    assert chunked['start'].tolist() == full['start'].tolist()
+    assert chunked['end'].tolist() == full['end'].tolist()
+
+
+def test_bad_dates_in_other_groups_are_ignored(tmp_path):
+    path = write_activity(tmp_path / 'activity.xlsx', [
+        row(1, 'A'),
+        row(2, 'B', date='не дата'),
+    ])
+    df = load_activity(path, ['A'], chunk_size=10)
+    assert df['masterId'].tolist() == [1]
+
+
+def test_header_only_sheet(tmp_path):
+    path = write_activity(tmp_path / 'activity.xlsx', [])
+    with pytest.raises(ValueError, match='Файл активности пуст'):
+        load_activity(path, ['A'], chunk_size=10)
+
+
+def test_numeric_skill_groups(tmp_path):
+    path = write_activity(tmp_path / 'activity.xlsx', [row(1, 101), row(2, 102.5)])
+    skills = extract_unique_skills(pd.read_excel(path))
+    assert skills == ['101', '102.5']
+
+    full = load_activity(path, skills)
+    chunked = load_activity(path, skills, chunk_size=10)
+    assert full['masterId'].tolist() == chunked['masterId'].tolist() == [1, 2]
+
+
+def test_duplicate_headers(tmp_path):
+    header = HEADER + ['Основной функционал']
+    path = write_activity(tmp_path / 'activity.xlsx', [row(1, 'A') + ['x']], header=header)
+    full = load_activity(path, ['A'])
+    chunked = load_activity(path, ['A'], chunk_size=10)
+    assert list(chunked.columns) == list(full.columns)
+    assert chunked['func_lower'].tolist() == ['omni']
@@ -0,0 +1,89 @@
+import os
+import time
+import datetime as dt
+import pytest
+from markupsafe import Markup
+import sessions
+from app import app
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = sessions.MemoryStore()
+    monkeypatch.setattr(app, 'session_interface', sessions.ServerSideSessionInterface(store))
+    return store
+
+
+def test_anonymous_requests_are_not_stored(store):
+    client = app.test_client()
+    for _ in range(5):
+        resp = client.get('/')
+        assert resp.status_code == 200
+        assert 'Set-Cookie' not in resp.headers
+    assert len(store._data) == 0
+
+
+def test_session_round_trip(store):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['last_settings'] = {'skill_groups': ('A', 'B')}
+    assert len(store._data) == 1
+
+    resp = client.get('/')
+    assert 'Cookie' in resp.headers.get('Vary', '')
+    with client.session_transaction() as sess:
+        assert sess['last_settings'] == {'skill_groups': ('A', 'B')}
+
+
+def test_session_keeps_types_and_returns_copies(store):
+    client = app.test_client()
+    value = {
+        '_flashes': [('message', 'a')],
+        'uploaded': dt.datetime(2024, 2, 1, 9, 30, tzinfo=dt.timezone.utc),
+        'raw': b'\x00\x01',
+        'label': Markup('<b>A</b>'),
+    }
+    with client.session_transaction() as sess:
+        sess.update(value)
+
+    with client.session_transaction() as sess:
+        sess['_flashes'].append(('message', 'b'))
+        sess.modified = False
+
+    with client.session_transaction() as sess:
+        assert dict(sess) == value
+        assert isinstance(sess['label'], Markup)
+
+
+def make_store(backend, tmp_path):
+    if backend == 'memory':
+        return sessions.MemoryStore(max_age=60)
+    if backend == 'file':
+        return sessions.FileStore(str(tmp_path), max_age=60)
+    return sessions.SqliteStore(str(tmp_path / 'sessions.sqlite3'), max_age=60)
+
+
+def backdate(store, sid, seconds):
+    stamp = time.time() - seconds
+    if isinstance(store, sessions.MemoryStore):
+        store._data[sid] = (stamp, store._data[sid][1])
+    elif isinstance(store, sessions.FileStore):
+        os.utime(store._path(sid), (stamp, stamp))
+    else:
+        with store._connect() as conn:
+            conn.execute('UPDATE sessions SET updated = ? WHERE sid = ?', (stamp, sid))
+
+
+@pytest.mark.parametrize('backend', ['memory', 'file', 'sqlite'])
+def test_expiry_counts_from_last_access(backend, tmp_path):
+    store = make_store(backend, tmp_path)
+    store.set('active', 'payload')
+    store.set('idle', 'payload')
+
+    backdate(store, 'active', 50)
+    assert store.get('active') == 'payload'
+    backdate(store, 'idle', 90)
+    assert store.get('idle') is None
+
+    assert store.cleanup(60) == 1
+    assert store.get('active') == 'payload'
@@ -0,0 +1,56 @@
+import io
+import os
+import datetime as dt
+import pandas as pd
+import pytest
+import uploads
+from app import app
+from config import TEMP_DIR
+
+
+def make_activity_xlsx() -> bytes:
+    rows = [{
+        'activity_date': '01.02.2024',
+        'start_time': dt.time(9, 0),
+        'end_time': dt.time(12, 0),
+        'main_act': 'Чат',
+        'Основной функционал': 'omni',
+        'masterId': i,
+        'Скилл-группа': 'A',
+    } for i in range(3)]
+    buf = io.BytesIO()
+    pd.DataFrame(rows).to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+def spool_files():
+    return {f for f in os.listdir(TEMP_DIR) if f.startswith('upload_')}
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+def test_activity_without_extension(client):
+    before = spool_files()
+    resp = client.post('/', data={
+        'activity': (io.BytesIO(make_activity_xlsx()), 'export'),
+        'skill_groups[]': ['A'],
+        'selection_strategy': 'mass',
+    })
+    assert resp.status_code == 200
+    assert '<table' in resp.get_data(as_text=True)
+    assert spool_files() == before
+
+
+def test_oversized_part_removes_earlier_spools(client, monkeypatch):
+    monkeypatch.setattr(uploads, 'MAX_UPLOAD_SIZE', 1000)
+    before = spool_files()
+    resp = client.post('/', data={
+        'slots': (io.BytesIO(b'x' * 10), 'slots.xlsx'),
+        'activity': (io.BytesIO(b'x' * 5000), 'activity.xlsx'),
+        'skill_groups[]': ['A'],
+    })
+    assert resp.status_code == 302
+    assert spool_files() == before
@@ -0,0 +1,101 @@
+import os
+import uuid
+import hashlib
+import logging
+from flask import Request
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+from config import TEMP_DIR, MAX_UPLOAD_SIZE, UPLOAD_CHUNK_SIZE
+
+
+class SpooledUpload:
+    """
+    Файл загрузки, который пишется прямо на диск в TEMP_DIR.
+
+    Во время записи считает размер и SHA-256 содержимого; при превышении
+    MAX_UPLOAD_SIZE прерывает приём файла. При закрытии файл удаляется.
+    """
+
+    def __init__(self, max_size: int = MAX_UPLOAD_SIZE):
+        self.path = os.path.join(TEMP_DIR, f"upload_{uuid.uuid4()}.tmp")
+        self.max_size = max_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._file = open(self.path, 'w+b')
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            self.close()
+            raise RequestEntityTooLarge()
+        self._hash.update(data)
+        return self._file.write(data)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError as e:
+            logging.warning(f"Не удалось удалить файл загрузки {self.path}: {e}")
+
+    def __getattr__(self, name):
+        if name == '_file':
+            raise AttributeError(name)
+        return getattr(self._file, name)
+
+
+class SpoolingRequest(Request):
+    """
+    Запрос, у которого все загружаемые файлы спулятся на диск.
+
+    Запоминает созданные спулы и удаляет их при закрытии запроса, даже если
+    разбор формы прервался и request.files так и не был заполнен.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._spools = []
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if content_length is not None and content_length > MAX_UPLOAD_SIZE:
+            raise RequestEntityTooLarge()
+        spool = SpooledUpload(max_size=MAX_UPLOAD_SIZE)
+        self._spools.append(spool)
+        return spool
+
+    def close(self) -> None:
+        super().close()
+        for spool in self._spools:
+            spool.close()
+
+
+def spool_upload(file: FileStorage) -> str:
+    """
+    Возвращает путь к файлу загрузки на диске.
+
+    Если файл уже заспулен SpoolingRequest, возвращает его путь; иначе
+    копирует поток в TEMP_DIR порциями по UPLOAD_CHUNK_SIZE байт.
+    """
+    stream = file.stream
+    if not isinstance(stream, SpooledUpload):
+        stream = SpooledUpload(max_size=MAX_UPLOAD_SIZE)
+        try:
+            while True:
+                chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                stream.write(chunk)
+        except Exception:
+            stream.close()
+            raise
+        file.stream = stream
+
+    stream.flush()
+    logging.info(f"Файл '{file.filename}' принят: {stream.size} байт, sha256={stream.sha256}")
+    return stream.path